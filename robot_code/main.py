@@ -1,55 +1,162 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import matplotlib.pyplot as plt
+import argparse
+import glob
+import os
+import sys
+
 import numpy as np
-from matplotlib.patches import Circle, FancyArrow
-import csv
+
+
+PATH_DTYPE = np.dtype([('Time', 'f8'), ('X', 'f8'), ('Y', 'f8'),
+                       ('Theta', 'f8'), ('Light', 'i4'), ('Dist', 'i4')])
+
+# bump when PATH_DTYPE or the parsing of the CSV changes
+CACHE_VERSION = 1
+
+
+def cache_path(filename):
+    st = os.stat(filename)
+    return f'{filename}.v{CACHE_VERSION}-{st.st_size}-{st.st_mtime_ns}.npy'
+
+
+def save_cache(filename, cache, arr):
+    tmp = f'{cache}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            np.save(f, arr)
+        os.replace(tmp, cache)
+    except OSError:
+        return
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    for stale in glob.glob(glob.escape(filename) + '.v*.npy'):
+        if stale != cache:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def read_path_records(filename):
+    cache = cache_path(filename)
+    if os.path.exists(cache):
+        try:
+            arr = np.load(cache, mmap_mode='r')
+            if arr.dtype == PATH_DTYPE:
+                return arr
+        except (OSError, ValueError, EOFError):
+            pass
+
+    arr = np.loadtxt(filename, delimiter=',', skiprows=1, dtype=PATH_DTYPE, ndmin=1)
+    if len(arr) > 0:
+        save_cache(filename, cache, arr)
+    return arr
 
 
 def read_path_data(filename):
-    time_data = []
-    x_data = []
-    y_data = []
-    theta_data = []
-    light_data = []
-    distance_data = []
-
-    with open(filename, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            time_data.append(float(row['Time']))
-            x_data.append(float(row['X']))
-            y_data.append(float(row['Y']))
-            theta_data.append(float(row['Theta']))
-            light_data.append(int(row['Light']))
-            distance_data.append(int(row['Dist']))
+    arr = read_path_records(filename)
+
+    return {
+        'time': arr['Time'],
+        'x': arr['X'],
+        'y': arr['Y'],
+        'theta': arr['Theta'],
+        'light': arr['Light'],
+        'distance': arr['Dist']
+    }
+
+
+def compute_stats(data):
+    total_distance = float(np.hypot(np.diff(data['x']), np.diff(data['y'])).sum())
+    total_time = (data['time'][-1] - data['time'][0]) / 1000.0
 
     return {
-        'time': np.array(time_data),
-        'x': np.array(x_data),
-        'y': np.array(y_data),
-        'theta': np.array(theta_data),
-        'light': np.array(light_data),
-        'distance': np.array(distance_data)
+        'n': len(data['x']),
+        'dist': total_distance,
+        'time': total_time,
+        'speed': total_distance / total_time if total_time > 0 else 0,
+        'xmin': data['x'].min(),
+        'xmax': data['x'].max(),
+        'ymin': data['y'].min(),
+        'ymax': data['y'].max(),
+        'light_mean': data['light'].mean(),
+        'dist_last': data['distance'][-1]
     }
 
 
-def plot_robot_path(data, save_figure=True):
-    fig = plt.figure(figsize=(16, 10))
+def minmax_decimate(y, n_out):
+    n = len(y)
+    n_bins = n_out // 2
+    if n <= n_out or n_bins < 1:
+        return np.arange(n)
+
+    bin_size = -(-n // n_bins)
+    n_bins = n // bin_size
+    m = n_bins * bin_size
+    blocks = y[:m].reshape(n_bins, bin_size)
+    offsets = np.arange(n_bins) * bin_size
+    pairs = np.stack([blocks.argmin(axis=1) + offsets,
+                      blocks.argmax(axis=1) + offsets], axis=1)
+    if m < n:
+        tail = y[m:]
+        pairs = np.vstack([pairs, [tail.argmin() + m, tail.argmax() + m]])
+    return np.sort(pairs, axis=1).ravel()
+
+
+def stride_indices(n, max_points):
+    if n <= max_points:
+        return np.arange(n)
+
+    step = -(-(n - 1) // (max_points - 1))
+    idx = np.arange(0, n, step)
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return idx
+
+
+def prepare_plot_data(data, max_points=5000, dark_threshold=45):
+    path_idx = stride_indices(len(data['x']), max_points)
+    return {
+        'theta_deg': data['theta'] * 0.01,
+        'time_sec': data['time'] * 0.001,
+        'path_idx': path_idx,
+        'path_x': data['x'][path_idx],
+        'path_y': data['y'][path_idx],
+        'dark_mask': data['light'] < dark_threshold
+    }
+
+
+def _draw_analysis_panels(fig, axes, data, stats, prep, max_points):
+    from matplotlib.collections import LineCollection
+
+    ax1, ax2, ax3, ax4, ax5, ax6 = axes
+    theta_deg = prep['theta_deg']
+    time_sec = prep['time_sec']
+    path_x = prep['path_x']
+    path_y = prep['path_y']
 
-    ax1 = plt.subplot(2, 3, 1)
-    ax1.plot(data['x'], data['y'], 'b-', linewidth=2, label='Robot Path')
+    ax1.plot(path_x, path_y, 'b-', linewidth=2, label='Robot Path', rasterized=True)
     ax1.plot(data['x'][0], data['y'][0], 'go', markersize=12, label='Start')
     ax1.plot(data['x'][-1], data['y'][-1], 'ro', markersize=12, label='End')
 
     skip = max(1, len(data['x']) // 15)
-    for i in range(0, len(data['x']), skip):
-        theta_rad = np.deg2rad(data['theta'][i] / 100.0)
-        dx = 3 * np.cos(theta_rad)
-        dy = 3 * np.sin(theta_rad)
-        ax1.arrow(data['x'][i], data['y'][i], dx, dy,
-                  head_width=2, head_length=1.5, fc='red', ec='red', alpha=0.6)
+    idx = np.arange(0, len(data['x']), skip)
+    xs = data['x'][idx]
+    ys = data['y'][idx]
+    theta_rad = np.deg2rad(theta_deg[idx])
+    # quiver lengths include the head, so add the 1.5 cm head to the 3 cm shaft
+    dxs = 4.5 * np.cos(theta_rad)
+    dys = 4.5 * np.sin(theta_rad)
+    ax1.quiver(xs, ys, dxs, dys, angles='xy', scale_units='xy', scale=1,
+               units='xy', width=0.25, headwidth=8, headlength=6,
+               headaxislength=6, color='red', alpha=0.6)
 
     ax1.set_xlabel('X Position (cm)', fontsize=12)
     ax1.set_ylabel('Y Position (cm)', fontsize=12)
@@ -58,13 +165,18 @@ def plot_robot_path(data, save_figure=True):
     ax1.grid(True, alpha=0.3)
     ax1.axis('equal')
 
-    ax2 = plt.subplot(2, 3, 2)
-    scatter = ax2.scatter(data['x'], data['y'], c=data['light'],
-                          cmap='RdYlGn_r', s=50, alpha=0.7)
+    path_light = data['light'][prep['path_idx']]
+    points = np.array([path_x, path_y]).T.reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    light_path = LineCollection(segments, cmap='RdYlGn_r', linewidth=4, alpha=0.7,
+                                array=(path_light[:-1] + path_light[1:]) * 0.5,
+                                rasterized=True)
+    ax2.add_collection(light_path)
+    ax2.autoscale()
     ax2.plot(data['x'][0], data['y'][0], 'go', markersize=12, label='Start')
     ax2.plot(data['x'][-1], data['y'][-1], 'ro', markersize=12, label='End')
 
-    plt.colorbar(scatter, ax=ax2, label='Light Sensor Value')
+    fig.colorbar(light_path, ax=ax2, label='Light Sensor Value')
     ax2.set_xlabel('X Position (cm)', fontsize=12)
     ax2.set_ylabel('Y Position (cm)', fontsize=12)
     ax2.set_title('Path with Light Sensor Data', fontsize=14, fontweight='bold')
@@ -72,15 +184,14 @@ def plot_robot_path(data, save_figure=True):
     ax2.grid(True, alpha=0.3)
     ax2.axis('equal')
 
-    ax3 = plt.subplot(2, 3, 3)
-    dark_threshold = 45
-    dark_points_x = data['x'][data['light'] < dark_threshold]
-    dark_points_y = data['y'][data['light'] < dark_threshold]
+    dark_points_x = data['x'][prep['dark_mask']]
+    dark_points_y = data['y'][prep['dark_mask']]
 
-    ax3.plot(data['x'], data['y'], 'b-', linewidth=1, alpha=0.3, label='Full Path')
+    ax3.plot(path_x, path_y, 'b-', linewidth=1, alpha=0.3, label='Full Path',
+             rasterized=True)
     if len(dark_points_x) > 0:
-        ax3.scatter(dark_points_x, dark_points_y, c='black', s=80,
-                    label='Black Line Position', marker='s', alpha=0.8)
+        ax3.plot(dark_points_x, dark_points_y, 'ks', markersize=9, linestyle='None',
+                 label='Black Line Position', alpha=0.8, rasterized=True)
 
     ax3.plot(data['x'][0], data['y'][0], 'go', markersize=12, label='Start')
     ax3.plot(data['x'][-1], data['y'][-1], 'ro', markersize=12, label='End')
@@ -92,19 +203,21 @@ def plot_robot_path(data, save_figure=True):
     ax3.grid(True, alpha=0.3)
     ax3.axis('equal')
 
-    ax4 = plt.subplot(2, 3, 4)
-    time_sec = data['time'] / 1000.0
-    ax4.plot(time_sec, data['theta'] / 100.0, 'purple', linewidth=2)
+    theta_idx = minmax_decimate(theta_deg, max_points)
+    ax4.plot(time_sec[theta_idx], theta_deg[theta_idx], 'purple', linewidth=2)
     ax4.set_xlabel('Time (seconds)', fontsize=12)
     ax4.set_ylabel('Orientation (degrees)', fontsize=12)
     ax4.set_title('Robot Orientation vs Time', fontsize=12, fontweight='bold')
     ax4.grid(True, alpha=0.3)
 
-    ax5 = plt.subplot(2, 3, 5)
     ax5_twin = ax5.twinx()
 
-    line1 = ax5.plot(time_sec, data['light'], 'orange', linewidth=2, label='Light Sensor')
-    line2 = ax5_twin.plot(time_sec, data['distance'], 'cyan', linewidth=2, label='Distance Sensor')
+    light_idx = minmax_decimate(data['light'], max_points)
+    distance_idx = minmax_decimate(data['distance'], max_points)
+    line1 = ax5.plot(time_sec[light_idx], data['light'][light_idx],
+                     'orange', linewidth=2, label='Light Sensor')
+    line2 = ax5_twin.plot(time_sec[distance_idx], data['distance'][distance_idx],
+                          'cyan', linewidth=2, label='Distance Sensor')
 
     ax5.set_xlabel('Time (seconds)', fontsize=12)
     ax5.set_ylabel('Light Sensor Value', fontsize=12, color='orange')
@@ -118,107 +231,200 @@ def plot_robot_path(data, save_figure=True):
     ax5.set_title('Sensor Readings vs Time', fontsize=12, fontweight='bold')
     ax5.grid(True, alpha=0.3)
 
-    ax6 = plt.subplot(2, 3, 6)
     ax6.axis('off')
 
-    dx = np.diff(data['x'])
-    dy = np.diff(data['y'])
-    distances = np.sqrt(dx ** 2 + dy ** 2)
-    total_distance = np.sum(distances)
-    total_time = (data['time'][-1] - data['time'][0]) / 1000.0
-    avg_speed = total_distance / total_time if total_time > 0 else 0
-
     stats_text = f"""
     Path Statistics
     ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-    Data Points: {len(data['x'])}
+    Data Points: {stats['n']}
 
-    Total Distance: {total_distance:.1f} cm
+    Total Distance: {stats['dist']:.1f} cm
 
-    Total Time: {total_time:.1f} seconds
+    Total Time: {stats['time']:.1f} seconds
 
-    Average Speed: {avg_speed:.1f} cm/s
+    Average Speed: {stats['speed']:.1f} cm/s
 
-    X Range: {np.min(data['x']):.1f} to {np.max(data['x']):.1f} cm
+    X Range: {stats['xmin']:.1f} to {stats['xmax']:.1f} cm
 
-    Y Range: {np.min(data['y']):.1f} to {np.max(data['y']):.1f} cm
+    Y Range: {stats['ymin']:.1f} to {stats['ymax']:.1f} cm
 
-    Average Light: {np.mean(data['light']):.1f}
+    Average Light: {stats['light_mean']:.1f}
 
-    Final Distance: {data['distance'][-1]} cm
+    Final Distance: {stats['dist_last']} cm
     """
 
     ax6.text(0.1, 0.5, stats_text, fontsize=11, family='monospace',
              verticalalignment='center', bbox=dict(boxstyle='round',
                                                    facecolor='wheat', alpha=0.5))
 
-    plt.suptitle('Robot Odometry Analysis',
-                 fontsize=16, fontweight='bold', y=0.98)
-    plt.tight_layout()
+
+def _draw_simple_panel(ax, data, prep):
+    ax.plot(prep['path_x'], prep['path_y'], 'b-', linewidth=3, rasterized=True)
+    ax.plot(data['x'][0], data['y'][0], 'go', markersize=15, label='Start')
+    ax.plot(data['x'][-1], data['y'][-1], 'ro', markersize=15, label='End')
+
+    skip = max(1, len(data['x']) // 10)
+    idx = np.arange(0, len(data['x']), skip)
+    xs = data['x'][idx]
+    ys = data['y'][idx]
+    theta_rad = np.deg2rad(prep['theta_deg'][idx])
+    # quiver lengths include the head, so add the 2 cm head to the 4 cm shaft
+    dxs = 6 * np.cos(theta_rad)
+    dys = 6 * np.sin(theta_rad)
+    ax.quiver(xs, ys, dxs, dys, angles='xy', scale_units='xy', scale=1,
+              units='xy', width=0.25, headwidth=12, headlength=8,
+              headaxislength=8, color='red', alpha=0.7)
+
+    ax.set_xlabel('X Position (cm)', fontsize=14)
+    ax.set_ylabel('Y Position (cm)', fontsize=14)
+    ax.set_title('Robot Path', fontsize=16, fontweight='bold')
+    ax.legend(fontsize=12)
+    ax.grid(True, alpha=0.4)
+    ax.axis('equal')
+
+
+def _finish_figure(fig, filename, save_figure, dpi, show):
+    import matplotlib.pyplot as plt
 
     if save_figure:
-        plt.savefig('robot_path_analysis.png', dpi=300, bbox_inches='tight')
-        print("Image saved: robot_path_analysis.png")
+        fig.savefig(filename, dpi=dpi)
+        print(f"Image saved: {filename}")
 
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
 
 
-def plot_simple_path(data, save_figure=True):
-    plt.figure(figsize=(10, 10))
+def plot_robot_path(data, save_figure=True, stats=None, max_points=5000, dpi=150,
+                    show=True, prep=None):
+    import matplotlib.pyplot as plt
 
-    plt.plot(data['x'], data['y'], 'b-', linewidth=3)
-    plt.plot(data['x'][0], data['y'][0], 'go', markersize=15, label='Start')
-    plt.plot(data['x'][-1], data['y'][-1], 'ro', markersize=15, label='End')
+    if stats is None:
+        stats = compute_stats(data)
+    if prep is None:
+        prep = prepare_plot_data(data, max_points)
 
-    skip = max(1, len(data['x']) // 10)
-    for i in range(0, len(data['x']), skip):
-        theta_rad = np.deg2rad(data['theta'][i] / 100.0)
-        dx = 4 * np.cos(theta_rad)
-        dy = 4 * np.sin(theta_rad)
-        plt.arrow(data['x'][i], data['y'][i], dx, dy,
-                  head_width=3, head_length=2, fc='red', ec='red', alpha=0.7)
-
-    plt.xlabel('X Position (cm)', fontsize=14)
-    plt.ylabel('Y Position (cm)', fontsize=14)
-    plt.title('Robot Path', fontsize=16, fontweight='bold')
-    plt.legend(fontsize=12)
-    plt.grid(True, alpha=0.4)
-    plt.axis('equal')
+    fig = plt.figure(figsize=(16, 10), constrained_layout=True)
+    axes = [fig.add_subplot(2, 3, i) for i in range(1, 7)]
+    _draw_analysis_panels(fig, axes, data, stats, prep, max_points)
+    fig.suptitle('Robot Odometry Analysis',
+                 fontsize=16, fontweight='bold')
+
+    _finish_figure(fig, 'robot_path_analysis.png', save_figure, dpi, show)
+
+
+def plot_simple_path(data, save_figure=True, dpi=150, show=True, max_points=5000,
+                     prep=None):
+    import matplotlib.pyplot as plt
+
+    if prep is None:
+        prep = prepare_plot_data(data, max_points)
+
+    fig, ax = plt.subplots(figsize=(10, 10), constrained_layout=True)
+    _draw_simple_panel(ax, data, prep)
+
+    _finish_figure(fig, 'robot_path_simple.png', save_figure, dpi, show)
 
-    if save_figure:
-        plt.savefig('robot_path_simple.png', dpi=300, bbox_inches='tight')
-        print("Image saved: robot_path_simple.png")
 
-    plt.show()
+def plot_all(data, save_figure=True, stats=None, max_points=5000, dpi=150, show=True):
+    import matplotlib.pyplot as plt
 
+    if stats is None:
+        stats = compute_stats(data)
+    prep = prepare_plot_data(data, max_points)
+
+    fig = plt.figure(figsize=(26, 10), constrained_layout=True)
+    grid = fig.add_gridspec(2, 5)
+    axes = [fig.add_subplot(grid[row, col]) for row in range(2) for col in range(3)]
+    _draw_analysis_panels(fig, axes, data, stats, prep, max_points)
+    _draw_simple_panel(fig.add_subplot(grid[:, 3:]), data, prep)
+    fig.suptitle('Robot Odometry Analysis',
+                 fontsize=16, fontweight='bold')
+
+    _finish_figure(fig, 'robot_path_all.png', save_figure, dpi, show)
+
+
+def int_at_least(minimum):
+    def parse(value):
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or number < minimum:
+            raise argparse.ArgumentTypeError(
+                f"must be an integer >= {minimum}, got {value!r}")
+        return number
+    return parse
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Robot Path Visualization')
+    parser.add_argument('--file', default='path.txt',
+                        help='odometry CSV logged by the robot (default: path.txt)')
+    parser.add_argument('--simple', action='store_true',
+                        help='also generate the simple path plot')
+    parser.add_argument('--no-show', action='store_true',
+                        help='save figures without opening a window')
+    parser.add_argument('--dpi', type=int_at_least(1), default=150,
+                        help='resolution of the saved images (default: 150)')
+    parser.add_argument('--max-points', type=int_at_least(2), default=5000,
+                        help='maximum samples drawn per series, at least 2 (default: 5000)')
+    return parser.parse_args(argv)
+
+
+def has_display():
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    interactive = not argv
+    args = parse_args(argv)
+
+    show = not args.no_show and has_display()
+    if not show:
+        import matplotlib
+        matplotlib.use('Agg')
 
-def main():
     print("=" * 60)
     print("Robot Path Visualization")
     print("=" * 60)
 
-    filename = input("\nEnter filename (default: path.txt): ").strip()
-    if not filename:
-        filename = 'path.txt'
+    filename = args.file
+    if interactive:
+        filename = input("\nEnter filename (default: path.txt): ").strip()
+        if not filename:
+            filename = 'path.txt'
 
     try:
         print(f"\nReading file: {filename}")
         data = read_path_data(filename)
-        print(f"Read {len(data['x'])} data points")
+        stats = compute_stats(data)
+        print(f"Read {stats['n']} data points")
 
         print("\nBasic Information:")
-        print(f"   - X Range: {np.min(data['x']):.1f} to {np.max(data['x']):.1f} cm")
-        print(f"   - Y Range: {np.min(data['y']):.1f} to {np.max(data['y']):.1f} cm")
-        print(f"   - Total Time: {(data['time'][-1] - data['time'][0]) / 1000:.1f} seconds")
-
-        print("\nGenerating full analysis plot...")
-        plot_robot_path(data, save_figure=True)
-
-        choice = input("\nDo you want a simple plot too? (y/n): ").strip().lower()
-        if choice == 'y' or choice == 'yes':
-            print("\nGenerating simple path plot...")
-            plot_simple_path(data, save_figure=True)
+        print(f"   - X Range: {stats['xmin']:.1f} to {stats['xmax']:.1f} cm")
+        print(f"   - Y Range: {stats['ymin']:.1f} to {stats['ymax']:.1f} cm")
+        print(f"   - Total Time: {stats['time']:.1f} seconds")
+
+        simple = args.simple
+        if interactive:
+            choice = input("\nDo you want a simple plot too? (y/n): ").strip().lower()
+            simple = choice == 'y' or choice == 'yes'
+
+        if simple:
+            print("\nGenerating full analysis and simple path plot...")
+            plot_all(data, save_figure=True, stats=stats, max_points=args.max_points,
+                     dpi=args.dpi, show=show)
+        else:
+            print("\nGenerating full analysis plot...")
+            plot_robot_path(data, save_figure=True, stats=stats, max_points=args.max_points,
+                            dpi=args.dpi, show=show)
 
         print("\nCompleted successfully!")
         print("=" * 60)